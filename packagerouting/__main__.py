@@ -1,29 +1,31 @@
 import csv
 import os
 import re
-from datetime import date, time, datetime, timedelta
-from collections import defaultdict, deque
+from datetime import date, time, datetime
+from collections import defaultdict
 from typing import Dict, List
 
-from packagerouting.datastructures import HashTable, Graph
-from packagerouting.entities import Package, Truck, Constraint, Status
+from packagerouting.datastructures import HashTable, Graph, DisjointSet
+from packagerouting.entities import Package, PackageGroup, Route, Truck, Constraint, Status
 
 
 START_OF_DAY = datetime.combine(date.today(), time(8,0,0))
 END_OF_DAY = datetime.combine(date.today(), time(23,59,59))
+HUB = Package("hub", "1", END_OF_DAY, 0)     # Shared stand-in package for the hub at either end of a route
 
 distance_graph: Graph = None
 package_table: HashTable = None
 location_dict: Dict = None
-dependencies: Dict = None
-routes: List[Dict] = None
+groups: Dict[str, PackageGroup] = None
+routes: List[Route] = None
 trucks: List[Truck] = None
 
 
 def load_data():
     """Loads data from csv files."""
-    global distance_graph, package_table, location_dict, dependencies
-    distance_graph, package_table, location_dict, dependencies = Graph(), HashTable(), {}, defaultdict(set)
+    global distance_graph, package_table, location_dict, groups, routes
+    distance_graph, package_table, location_dict, groups = Graph(), HashTable(), {}, {}
+    routes = None   # Routes refer to the previously loaded packages
     basepath = os.path.dirname(__file__)
     if basepath:
         basepath += "/"
@@ -41,9 +43,7 @@ def load_data():
         for line in reader:
             pkg = parse_package(*line)
             package_table[line[0]] = pkg
-        for id in dependencies:
-            for dep in dependencies[id]:
-                package_table[id].constraints[Constraint.DELIVER_WITH].add(dep)
+        groups = build_groups(package_table)
 
     with open(f"{basepath}data/locations.csv") as file:
         reader = csv.DictReader(file, delimiter=',', quotechar='"')
@@ -78,114 +78,158 @@ def parse_package(id: str, location: str, time: str, mass: str, note: str):
         # Delayed on flight---will not arrive to depot until <time>
         pkg.constraints[Constraint.DELAYED] = parse_time(matches[0][0])
     elif note[0] == "M":
-        # Must be delivered with <id, id>
-        dependencies[pkg.id].add(pkg.id)
-        for m in matches:
-            dependencies[pkg.id].update(dependencies[m[1]], [m[1]])
-        for id in dependencies[pkg.id]:
-            dependencies[id] = dependencies[pkg.id]
+        # Must be delivered with <id, id>, build_groups resolves these into whole groups
+        pkg.constraints[Constraint.DELIVER_WITH].update(m[1] for m in matches)
     elif note[0] == "C":
         # Can only be on truck <id>
         pkg.constraints[Constraint.TRUCK] = matches[0][1]
     return pkg
 
 
-def build_route(deliverable: HashTable, dist_graph: Graph, start: datetime, truck: Truck, skew: float = 0):
+def build_groups(package_table: HashTable):
+    """
+    Indexes DELIVER_WITH groups with union-find so routing can treat each as a single stop set, O(n) time and space.
+    Every member's DELIVER_WITH is widened to the whole group. Group constraints are copied from the members,
+    so rebuild after changing a member's constraints.
+    """
+    sets = DisjointSet()
+    for id in package_table:
+        pack = package_table[id]
+        if Constraint.DELIVER_WITH in pack.constraints:
+            for dep in pack.constraints[Constraint.DELIVER_WITH]:
+                if dep in package_table:
+                    sets.union(id, dep)
+    members = defaultdict(list)
+    for id in package_table:
+        if id in sets:
+            members[sets.find(id)].append(id)   # Package table order
+    groups = {}
+    for ids in members.values():
+        group = PackageGroup([package_table[id] for id in ids])
+        for id in ids:
+            package_table[id].constraints[Constraint.DELIVER_WITH].update(ids)
+            groups[id] = group
+    return groups
+
+
+def build_route(deliverable: HashTable, dist_graph: Graph, start: datetime, truck: Truck, skew: float = 0,
+                groups: Dict[str, PackageGroup] = None, catalog: List[Package] = None, index: Dict[str, int] = None):
     """
     Constructs a route utilizing shortest path and selection variables to adjust selection criteria, 
     O(n²) time and O(k) space where n is the number of deliverable packages and k is the length of the route.
+    DELIVER_WITH groups are loaded atomically and only when the whole group fits, their members are then visited
+    as they become the nearest stop or, once the truck is full, inserted where they add the least distance. Stops are recorded as indices into catalog, which defaults to the deliverable packages,
+    index maps a package id to its catalog index and is derived from catalog when not passed.
     """
-    dummy = Package("dummy", "1", END_OF_DAY, 0)    # Dummy package to serve as starting location
-    route = {"start": start, "ordered": deque([{"package": dummy}]), "contains": {}, "dependents": {}, "truck": truck}
-    while len(route["ordered"]) + len(route["dependents"]) < truck.capacity + 1 and len(deliverable) > 0:
-        section = route["ordered"]
+    if groups is None:
+        groups = build_groups(deliverable)
+    if catalog is None:
+        catalog = [deliverable[id] for id in deliverable]
+    if index is None:
+        index = {pack.id: i for i, pack in enumerate(catalog)}
+    for id in deliverable:
+        if id in groups and any(member.id not in deliverable for member in groups[id].packages):
+            raise ValueError(f"package {id} is grouped with packages that aren't deliverable, rebuild groups")
+    stops = []
+    load = 0
+    pending = []    # Loaded group members that haven't been visited yet
+    while load < truck.capacity and len(deliverable) > 0:
+        here = catalog[stops[-1]].location_id if stops else HUB.location_id
         min_dist = float('inf')
-        min_id = None
-        # Really just a big min function
+        min_pack = None
+        min_members = None
+        for pack in pending:
+            curr_dist = dist_graph.get_dist(here, pack.location_id).weight
+            if pack.deadline < END_OF_DAY:
+                curr_dist -= skew
+            if curr_dist < min_dist or curr_dist == min_dist and pack.deadline < END_OF_DAY:
+                min_dist, min_pack, min_members = curr_dist, pack, []
+        # Really just a big min function, groups are weighed once through their first member
         for id in deliverable:
             pack = deliverable[id]
-            if pack.constraints:
-                if Constraint.DELAYED in pack.constraints:
-                    if route["start"] < pack.constraints[Constraint.DELAYED]:
+            group = groups.get(id)
+            if group is not None and group.packages[0].id != id:
+                continue
+            candidate = group or pack
+            members = group.packages if group else [pack]
+            if load + len(members) > truck.capacity:
+                continue
+            if candidate.constraints:
+                if Constraint.DELAYED in candidate.constraints:
+                    if start < candidate.constraints[Constraint.DELAYED]:
                         continue
-                if Constraint.TRUCK in pack.constraints:
-                    if route["truck"] is not None and route["truck"].id != pack.constraints[Constraint.TRUCK]:
+                if Constraint.TRUCK in candidate.constraints:
+                    if truck is not None and truck.id != candidate.constraints[Constraint.TRUCK]:
                         continue
-            curr_dist = dist_graph.get_dist(section[-1]["package"].location_id, pack.location_id).weight
-            if pack.deadline < END_OF_DAY:
+            if group is None:
+                nearest = pack
+                curr_dist = dist_graph.get_dist(here, pack.location_id).weight
+            else:
+                location = min(group.locations, key=lambda location: dist_graph.get_dist(here, location).weight)
+                nearest = next(member for member in members if member.location_id == location)
+                curr_dist = dist_graph.get_dist(here, location).weight
+            if candidate.deadline < END_OF_DAY:
                 curr_dist -= skew   # Skew the distance based on some factor to make a selection more "favorable"
-            if curr_dist < min_dist or curr_dist == min_dist and pack.deadline < END_OF_DAY:
-                min_dist = curr_dist
-                min_id = id
-        # Got our min, pop it and load it
-        min_pack = deliverable.pop(min_id)
-        section.append({"package": min_pack})
-        route["dependents"].pop(min_pack.id, None)
-        route["contains"][min_pack.id] = min_pack
-        if min_pack.constraints:
-            if Constraint.DELIVER_WITH in min_pack.constraints:
-                for id in min_pack.constraints[Constraint.DELIVER_WITH]:
-                    if id in route["contains"]:
-                        continue
-                    route["dependents"][id] = deliverable[id]
-    # Annoying leftover things
-    route["ordered"].append({"package": dummy})
-    jam_dependents_in(route, deliverable, dist_graph)
-    slap_stats_on(route, dist_graph)
-    return route
-
-
-def jam_dependents_in(route: Dict, deliverable: HashTable, dist_graph: Graph):
+            if curr_dist < min_dist or curr_dist == min_dist and candidate.deadline < END_OF_DAY:
+                min_dist, min_pack, min_members = curr_dist, nearest, members
+        if min_pack is None:
+            break   # Nothing new that this route can take
+        # Got our min, load it (and the rest of its group) and visit it
+        for member in min_members:
+            deliverable.pop(member.id)
+            if member is not min_pack:
+                pending.append(member)
+        load += len(min_members)
+        pending = [pack for pack in pending if pack is not min_pack]
+        stops.append(index[min_pack.id])
+    # Members still waiting once the truck is full go wherever they add the least distance
+    for pack in pending:
+        locations = [HUB.location_id, *(catalog[i].location_id for i in stops), HUB.location_id]
+        min_i = min(range(1, len(locations)), key=lambda i:
+                    dist_graph.get_dist(locations[i-1], pack.location_id).weight
+                    + dist_graph.get_dist(pack.location_id, locations[i]).weight
+                    - dist_graph.get_dist(locations[i-1], locations[i]).weight)
+        stops.insert(min_i - 1, index[pack.id])
+    return Route(start, truck, catalog, stops, dist_graph, HUB)
+
+
+def route_generator(package_table: HashTable, dist_graph: Graph, trucks: List[Truck], ready: Dict = None, groups: Dict[str, PackageGroup] = None):
     """
-    Inserts straggling dependents that weren't previously placed in the route, 
-    O(n*k) time and O(k) space where n is the length of the route and k is the number of dependents
+    Generates routes by considering passed in variables to alter selection criteria, O(n²) time and O(n) space.
+    ready optionally maps a truck id to the earliest time that truck can leave the hub, a truck never leaves
+    before it's back from its previous route.
     """
-    real_route = route["ordered"]
-    for id in route["dependents"]:
-        pack = deliverable.pop(id)
-        min_i = None
-        min_dist = float('inf')
-        for i in range(1, len(real_route)):
-            # Sever distance between two packages, calculate new distance with this dependent between
-            before = dist_graph.get_dist(real_route[i-1]["package"].location_id, pack.location_id).weight
-            after = dist_graph.get_dist(real_route[i]["package"].location_id, pack.location_id).weight
-            sever = dist_graph.get_dist(real_route[i-1]["package"].location_id, real_route[i]["package"].location_id).weight
-            curr_dist = before + after - sever
-            if curr_dist < min_dist:
-                min_dist = curr_dist
-                min_i = i
-        real_route.insert(min_i, {"package": pack})
-
-
-def slap_stats_on(route: Dict, dist_graph: Graph):
-    """Slaps some stats on a route like time and distance for easier processing."""
-    real_route = route["ordered"]
-    total_time = route["start"]
-    total_dist = 0
-    for i in range(len(real_route)):
-        dist = 0 if i == 0 else dist_graph.get_dist(real_route[i-1]["package"].location_id, real_route[i]["package"].location_id).weight
-        total_time += timedelta(hours=dist/18)
-        total_dist += dist
-        real_route[i]["time"] = total_time
-        real_route[i]["distance"] = total_dist
-    route["total_distance"] = real_route[-1]["distance"]
-
-
-def route_generator(package_table: HashTable, dist_graph: Graph, trucks: List[Truck]):
-    """Generates routes by considering passed in variables to alter selection criteria, O(n²) time and O(n) space."""
-    if not package_table or not distance_graph:
+    if not package_table or not dist_graph:
         print("No data for simulation.")
-    global routes
+    if groups is None:
+        groups = build_groups(package_table)
+    capacity = max(truck.capacity for truck in trucks)
+    for key, group in groups.items():
+        if group.packages[0].id == key and group.count > capacity:
+            print(f"Warning: packages {', '.join(pack.id for pack in group.packages)} must be delivered together "
+                  f"but exceed truck capacity of {capacity}, they will not be delivered.")
+    ready = ready or {}
+    returns = {}    # Truck id -> time it's back at the hub
     routes = []
     deliverable = HashTable()
+    catalog, index = [], {}     # Shared by every route so stops can be stored as indices
     for id in package_table:
         pack = package_table[id]
         deliverable[pack.id] = pack
+        index[pack.id] = len(catalog)
+        catalog.append(pack)
     # I don't like that I hardcoded 3 specific routes with start times and assigned trucks.
     # Would be more robust if there were routines to calculate the ideal number and time/truck/skew combinations.
-    routes.append(build_route(deliverable, dist_graph, START_OF_DAY, truck=trucks[0], skew=0.5))
-    routes.append(build_route(deliverable, dist_graph, datetime.combine(date.today(), time(9,5,0)), truck=trucks[1], skew=0.5))
-    routes.append(build_route(deliverable, dist_graph, datetime.combine(date.today(), time(11,0,0)), truck=trucks[1], skew=0.5))
+    schedule = [
+        (START_OF_DAY, trucks[0]),
+        (datetime.combine(date.today(), time(9,5,0)), trucks[1]),
+        (datetime.combine(date.today(), time(11,0,0)), trucks[1]),
+    ]
+    for start, truck in schedule:
+        start = max(start, ready.get(truck.id, start), returns.get(truck.id, start))
+        route = build_route(deliverable, dist_graph, start, truck=truck, skew=0.5, groups=groups, catalog=catalog, index=index)
+        returns[truck.id] = route.arrival(len(route) - 1)
+        routes.append(route)
     return routes
 
 
@@ -195,29 +239,34 @@ def run_sim(target_time: datetime = END_OF_DAY):
     if trucks is None:
         trucks = [Truck('1'), Truck('2'), Truck('3')]
     if routes is None:
-        routes = route_generator(package_table, distance_graph, trucks)
+        routes = route_generator(package_table, distance_graph, trucks, groups=groups)
     # Set status based on target_time
     for truck in trucks:
         truck.mileage = 0
     for route in routes:
-        if route["start"] <= target_time:
-            # Deliver those packages
+        if route.start <= target_time:
+            # Deliver those packages, comparing offsets so only delivered stops need a datetime
+            elapsed = (target_time - route.start).total_seconds()
             added_miles = 0
-            for item in route["ordered"]:
-                if item["time"] <= target_time:
-                    item["package"].status = (Status.DELIVERED, item["time"])
-                    added_miles = item["distance"]
-                else:
-                    item["package"].status = (Status.EN_ROUTE, route["truck"])
+            for i, idx in enumerate(route.stops):
+                if route.offsets[i] <= elapsed:
+                    added_miles = route.distances[i]
+                    if idx != Route.HUB:
+                        route.catalog[idx].status = (Status.DELIVERED, route.arrival(i))
+                elif idx != Route.HUB:
+                    route.catalog[idx].status = (Status.EN_ROUTE, route.truck)
             for truck in trucks:
-                if route["truck"].id == truck.id:
+                if route.truck.id == truck.id:
                     truck.mileage += added_miles
         else:
-            for item in route["ordered"]:
-                item["package"].status = (Status.AT_HUB, None)
-                if Constraint.DELAYED in item["package"].constraints:
-                    if item["package"].constraints[Constraint.DELAYED] > target_time:
-                        item["package"].status = (Status.DELAYED, item["package"].constraints[Constraint.DELAYED])
+            for idx in route.stops:
+                if idx == Route.HUB:
+                    continue
+                pack = route.catalog[idx]
+                pack.status = (Status.AT_HUB, None)
+                if Constraint.DELAYED in pack.constraints:
+                    if pack.constraints[Constraint.DELAYED] > target_time:
+                        pack.status = (Status.DELAYED, pack.constraints[Constraint.DELAYED])
 
 
 def print_miles():
@@ -228,7 +277,7 @@ def print_miles():
     for truck in trucks:
         truck.mileage = 0
     for route in routes:
-        route["truck"].mileage += route["total_distance"]
+        route.truck.mileage += route.total_distance
     total_miles = 0
     for truck in trucks:
         print(f"Truck {truck.id} traveled {truck.mileage} miles")
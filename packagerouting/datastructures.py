@@ -251,4 +251,52 @@ class Graph:
             return self.weight < other.weight
         
         def __repr__(self):
-            return f"Weight: {self.weight} Path: {' -> '.join([n for n in self.nodes])}"
\ No newline at end of file
+            return f"Weight: {self.weight} Path: {' -> '.join([n for n in self.nodes])}"
+
+
+class DisjointSet:
+    """Union-find with path compression and union by rank. Used to index packages that must be delivered together."""
+    def __init__(self):
+        self.parent = {}
+        self.rank = {}
+
+    def add(self, item):
+        """Adds an item as its own singleton set if not already present."""
+        if item not in self.parent:
+            self.parent[item] = item
+            self.rank[item] = 0
+
+    def find(self, item):
+        """Returns the representative of the item's set, compressing the path along the way."""
+        self.add(item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        """Merges the sets containing a and b, returns the new representative."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        return a
+
+    def groups(self):
+        """Returns a dict of representative -> list of members in insertion order."""
+        groups = defaultdict(list)
+        for item in self.parent:
+            groups[self.find(item)].append(item)
+        return groups
+
+    def __contains__(self, item):
+        return item in self.parent
+
+    def __len__(self):
+        return len(self.parent)
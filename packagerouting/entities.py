@@ -1,5 +1,7 @@
-from datetime import datetime
-from typing import Optional, DefaultDict, Tuple, Any
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Optional, DefaultDict, Tuple, Any, List, Set
 from enum import Enum, auto
 from collections import defaultdict
 from dataclasses import dataclass
@@ -31,6 +33,29 @@ class Package:
         self.constraints: DefaultDict[(Constraint, Any)] = defaultdict(set)
 
 
+@dataclass
+class PackageGroup:
+    """PackageGroup models packages that must be delivered together, routed as a single super-node."""
+    def __init__(self, packages: List[Package]):
+        self.packages: List[Package] = packages
+        self.count: int = len(packages)
+        self.locations: Set[str] = {pack.location_id for pack in packages}
+        self.deadline: datetime = min(pack.deadline for pack in packages)
+        self.constraints: DefaultDict[(Constraint, Any)] = defaultdict(set)
+        for pack in packages:
+            # The group can't leave before its latest member arrives and must ride any truck a member requires
+            if Constraint.DELAYED in pack.constraints:
+                delayed = pack.constraints[Constraint.DELAYED]
+                if Constraint.DELAYED not in self.constraints or self.constraints[Constraint.DELAYED] < delayed:
+                    self.constraints[Constraint.DELAYED] = delayed
+            if Constraint.TRUCK in pack.constraints:
+                truck = pack.constraints[Constraint.TRUCK]
+                if Constraint.TRUCK in self.constraints and self.constraints[Constraint.TRUCK] != truck:
+                    ids = ", ".join(member.id for member in packages)
+                    raise ValueError(f"packages {ids} must be delivered together but require different trucks")
+                self.constraints[Constraint.TRUCK] = truck
+
+
 @dataclass
 class Truck:
     """Truck class models a delivery truck and its associated constraints and mileage."""
@@ -38,4 +63,71 @@ class Truck:
         self.id: str = id
         self.capacity: int = 16
         self.mph: int = 18
-        self.mileage: int = 0
\ No newline at end of file
+        self.mileage: int = 0
+
+
+class Route:
+    """
+    Route models a truck's trip in compact typed arrays: stop package indices into a shared catalog (HUB for the hub),
+    arrival offsets in whole seconds since start and cumulative distances. Indexing by the old route dict keys returns a
+    read-only view for code written against route dicts, hot paths should read the arrays directly.
+    """
+    HUB = -1
+
+    def __init__(self, start: datetime, truck: Truck, catalog: List[Package], stops: List[int], dist_graph, hub: Package):
+        self.start: datetime = start
+        self.truck: Truck = truck
+        self.catalog: List[Package] = catalog
+        self.hub: Package = hub
+        self.stops = array('i', [Route.HUB, *stops, Route.HUB])
+        locations = [self.package(i).location_id for i in range(len(self.stops))]
+        legs = [0.0] + [dist_graph.get_dist(a, b).weight for a, b in zip(locations, locations[1:])]
+        self.distances = array('d', accumulate(legs))
+        seconds_per_mile = 3600 / truck.mph
+        self.offsets = array('l', (round(d * seconds_per_mile) for d in self.distances))     # Whole seconds
+
+    @property
+    def total_distance(self) -> float:
+        return self.distances[-1]
+
+    def package(self, i: int) -> Package:
+        """Returns the package delivered at stop i."""
+        idx = self.stops[i]
+        return self.hub if idx == Route.HUB else self.catalog[idx]
+
+    def arrival(self, i: int) -> datetime:
+        """Returns the arrival time at stop i."""
+        return self.start + timedelta(seconds=self.offsets[i])
+
+    def __len__(self):
+        return len(self.stops)
+
+    def __iter__(self):
+        """Yields a read-only view of each stop."""
+        for i in range(len(self.stops)):
+            yield Route.Stop(self, i)
+
+    def __getitem__(self, key: str):
+        """Read-only view compatible with the previous route dict."""
+        if key == "ordered":
+            return list(self)
+        if key in ("start", "truck", "total_distance"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    class Stop:
+        """Local class viewing a single stop as the previous {"package", "time", "distance"} dict."""
+        __slots__ = ("route", "i")
+
+        def __init__(self, route, i: int):
+            self.route = route
+            self.i = i
+
+        def __getitem__(self, key: str):
+            if key == "package":
+                return self.route.package(self.i)
+            if key == "time":
+                return self.route.arrival(self.i)
+            if key == "distance":
+                return self.route.distances[self.i]
+            raise KeyError(key)
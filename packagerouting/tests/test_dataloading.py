@@ -17,4 +17,14 @@ def test_location_dict(setup):
 
 
 def test_package_table(setup):
-    assert ('1' in main.package_table) == True
\ No newline at end of file
+    assert ('1' in main.package_table) == True
+
+
+def test_groups(setup):
+    group = main.groups['14']
+    assert sorted(pack.id for pack in group.packages) == ['13', '14', '15', '16', '19', '20']
+    assert all(main.groups[pack.id] is group for pack in group.packages)
+
+
+def test_deliver_with(setup):
+    assert main.package_table['19'].constraints[main.Constraint.DELIVER_WITH] == {'13', '14', '15', '16', '19', '20'}
@@ -0,0 +1,25 @@
+import pytest
+
+from packagerouting.datastructures import DisjointSet
+
+
+@pytest.fixture
+def setup():
+    yield DisjointSet()
+
+
+def test_union(setup):
+    sets = setup
+    sets.union(1, 2)
+    sets.union(3, 4)
+    assert sets.find(1) == sets.find(2)
+    assert sets.find(1) != sets.find(3)
+
+
+def test_transitive(setup):
+    sets = setup
+    sets.union(1, 2)
+    sets.union(2, 3)
+    sets.add(4)
+    groups = sorted(sorted(members) for members in sets.groups().values())
+    assert groups == [[1, 2, 3], [4]]
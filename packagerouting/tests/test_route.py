@@ -0,0 +1,43 @@
+import pytest
+
+from datetime import datetime
+
+from packagerouting.datastructures import Graph
+import packagerouting.__main__ as main
+from packagerouting.entities import Package, Route, Truck, Status
+
+
+@pytest.fixture
+def setup():
+    graph = Graph()
+    graph.add_edge("1", "2", 9.0)
+    graph.add_edge("2", "3", 4.5)
+    graph.add_edge("1", "3", 18.0)
+    hub = Package("hub", "1", datetime(2000, 1, 1, 23, 59), 0)
+    catalog = [Package("a", "2", hub.deadline, 1), Package("b", "3", hub.deadline, 1)]
+    yield Route(datetime(2000, 1, 1, 8), Truck("1"), catalog, [0, 1], graph, hub)
+
+
+def test_stats(setup):
+    route = setup
+    assert list(route.distances) == [0.0, 9.0, 13.5, 27.0]
+    assert route.total_distance == 27.0
+    assert route.arrival(1) == datetime(2000, 1, 1, 8, 30)
+
+
+def test_view(setup):
+    route = setup
+    ordered = route["ordered"]
+    assert [item["package"].id for item in ordered] == ["hub", "a", "b", "hub"]
+    assert ordered[2]["time"] == datetime(2000, 1, 1, 8, 45)
+    with pytest.raises(KeyError):
+        route["contains"]
+
+
+def test_run_sim_at_arrival():
+    main.load_data()
+    main.run_sim()
+    for route in main.routes:
+        for i in range(1, len(route) - 1):
+            main.run_sim(route.arrival(i))
+            assert route.package(i).status == (Status.DELIVERED, route.arrival(i))
@@ -0,0 +1,96 @@
+import pytest
+
+import packagerouting.__main__ as main
+from packagerouting.datastructures import HashTable
+from packagerouting.entities import Package, PackageGroup, Truck, Constraint
+
+
+GROUP = ['13', '14', '15', '16', '19', '20']
+
+
+@pytest.fixture
+def setup():
+    main.load_data()
+    deliverable = HashTable()
+    for id in main.package_table:
+        deliverable[id] = main.package_table[id]
+    yield deliverable
+
+
+def route_ids(route):
+    return [route.package(i).id for i in range(1, len(route) - 1)]
+
+
+def test_group_on_single_route(setup):
+    routes = main.route_generator(main.package_table, main.distance_graph, [Truck('1'), Truck('2')])
+    holding = [route for route in routes if set(GROUP) & set(route_ids(route))]
+    assert len(holding) == 1
+    assert set(GROUP) <= set(route_ids(holding[0]))
+
+
+def test_capacity(setup):
+    deliverable = setup
+    truck = Truck('1')
+    truck.capacity = 5
+    route = main.build_route(deliverable, main.distance_graph, main.START_OF_DAY, truck, groups=main.groups)
+    assert len(route_ids(route)) <= truck.capacity
+    assert not set(GROUP) & set(route_ids(route))   # Group of 6 doesn't fit
+
+
+def test_oversize_group_warning(setup, capsys):
+    trucks = [Truck('1'), Truck('2')]
+    for truck in trucks:
+        truck.capacity = 5
+    main.route_generator(main.package_table, main.distance_graph, trucks)
+    assert "13, 14, 15, 16, 19, 20" in capsys.readouterr().out
+
+
+def test_group_delayed(setup):
+    deliverable = setup
+    main.package_table['19'].constraints[Constraint.DELAYED] = main.parse_time("9:05 am")
+    groups = main.build_groups(main.package_table)
+    early = main.build_route(deliverable, main.distance_graph, main.START_OF_DAY, Truck('1'), groups=groups)
+    assert not set(GROUP) & set(route_ids(early))
+    late = main.build_route(deliverable, main.distance_graph, main.parse_time("9:05 am"), Truck('1'), groups=groups)
+    assert set(GROUP) <= set(route_ids(late))
+
+
+def test_group_truck(setup):
+    deliverable = setup
+    main.package_table['19'].constraints[Constraint.TRUCK] = '2'
+    groups = main.build_groups(main.package_table)
+    wrong = main.build_route(deliverable, main.distance_graph, main.START_OF_DAY, Truck('1'), groups=groups)
+    assert not set(GROUP) & set(route_ids(wrong))
+    right = main.build_route(deliverable, main.distance_graph, main.START_OF_DAY, Truck('2'), groups=groups)
+    assert set(GROUP) <= set(route_ids(right))
+
+
+def test_conflicting_trucks():
+    a = Package('a', '1', main.END_OF_DAY, 1)
+    b = Package('b', '1', main.END_OF_DAY, 1)
+    a.constraints[Constraint.TRUCK] = '1'
+    b.constraints[Constraint.TRUCK] = '2'
+    with pytest.raises(ValueError):
+        PackageGroup([a, b])
+
+
+def test_truck_chaining(setup):
+    ready = {'2': main.parse_time("10:00 am")}
+    routes = main.route_generator(main.package_table, main.distance_graph, [Truck('1'), Truck('2')], ready=ready)
+    assert routes[1].start == ready['2']
+    assert routes[2].start >= routes[1].arrival(len(routes[1]) - 1)
+
+
+def test_bundled_mileage(setup):
+    routes = main.route_generator(main.package_table, main.distance_graph, [Truck('1'), Truck('2')])
+    assert round(sum(route.total_distance for route in routes), 1) <= 89.4
+    for route in routes:
+        for i in range(1, len(route) - 1):
+            assert route.arrival(i) <= route.package(i).deadline
+
+
+def test_groups_mismatch(setup):
+    deliverable = setup
+    deliverable.pop('13')
+    with pytest.raises(ValueError):
+        main.build_route(deliverable, main.distance_graph, main.START_OF_DAY, Truck('1'), groups=main.groups)
@@ -0,0 +1,76 @@
+import io
+from datetime import timedelta
+
+import pytest
+
+import packagerouting.__main__ as main
+from packagerouting.scenarios import Scenario, sweep, run_scenarios, time_points, write_csv
+
+
+@pytest.fixture(scope="module")
+def setup():
+    main.load_data()
+    main.run_sim()
+    yield time_points(main.START_OF_DAY, main.START_OF_DAY + timedelta(hours=6), timedelta(minutes=15))
+
+
+def test_sweep_matches_run_sim(setup):
+    # Ticks plus every departure and arrival, where simultaneous event ordering matters
+    times = set(setup)
+    for route in main.routes:
+        times.add(route.start)
+        times.update(route.arrival(i) for i in range(len(route)))
+    times = sorted(times)
+    table = sweep(main.routes, main.package_table, times)
+    rows = list(zip(table["time"], table["package_id"], table["status"]))
+    for target_time in times:
+        main.run_sim(target_time)
+        for row_time, id, status in rows:
+            if row_time == target_time:
+                assert main.package_table[id].status[0].name == status
+
+
+def test_delayed_perturbation(setup):
+    times = [main.parse_time("10:30 am")]
+    late = Scenario("late", delayed={"9": main.parse_time("11:00 am")})
+    table = run_scenarios(times, [Scenario(), late], workers=2)
+    statuses = {(s, id): status for s, id, status in zip(table["scenario"], table["package_id"], table["status"])}
+    assert statuses[("baseline", "9")] == "AT_HUB"
+    assert statuses[("late", "9")] == "DELAYED"
+
+
+def test_write_csv(setup):
+    table = sweep(main.routes, main.package_table, setup[:1])
+    file = io.StringIO()
+    write_csv(table, file)
+    assert len(file.getvalue().splitlines()) == len(main.package_table) + 1
+
+
+def test_delayed_group_member(setup):
+    times = [main.parse_time("10:30 am"), main.END_OF_DAY]
+    late = Scenario("late", delayed={"14": main.parse_time("11:00 am")})
+    table = run_scenarios(times, [late], workers=1)
+    rows = zip(table["time"], table["package_id"], table["status"], table["event_time"])
+    for row_time, id, status, event_time in rows:
+        if id in ("13", "14", "15", "16", "19", "20"):
+            if row_time == times[0]:
+                assert status in ("DELAYED", "AT_HUB")
+            else:
+                assert status == "DELIVERED" and event_time >= main.parse_time("11:00 am")
+
+
+def test_ready_perturbation(setup):
+    times = [main.parse_time("9:30 am")]
+    held = Scenario("held", ready={"2": main.parse_time("10:00 am")})
+    table = run_scenarios(times, [Scenario(), held], workers=2)
+    statuses = {(s, id): status for s, id, status in zip(table["scenario"], table["package_id"], table["status"])}
+    assert statuses[("baseline", "25")] in ("EN_ROUTE", "DELIVERED")
+    assert statuses[("held", "25")] == "AT_HUB"
+
+
+def test_edges_perturbation(setup):
+    times = [main.END_OF_DAY]
+    shortcut = Scenario("shortcut", edges=[("1", "25", 0.1)])
+    table = run_scenarios(times, [Scenario(), shortcut], workers=2)
+    delivered = {(s, id): when for s, id, when in zip(table["scenario"], table["package_id"], table["event_time"])}
+    assert delivered[("shortcut", "25")] < delivered[("baseline", "25")]